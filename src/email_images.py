@@ -1,17 +1,18 @@
 import asyncio
+import collections
+import concurrent.futures
 import datetime
 import os
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
 from email.mime.image import MIMEImage
-from email import encoders
+from email.generator import BytesGenerator
 from typing import Any, ClassVar, Mapping, Optional, Sequence
 from typing_extensions import Self
 from viam.components.camera import Camera
+from viam.media.video import CameraMimeType
 from viam.components.sensor import Sensor
-from viam.module.module import Module
 from viam.proto.app.robot import ComponentConfig
 from viam.proto.common import ResourceName
 from viam.resource.base import ResourceBase
@@ -23,10 +24,136 @@ from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
 import functools
 import json
+import re
+import shutil
+import subprocess
+import threading
 import fasteners
 
+__all__ = ["EmailImages"]
+
 LOGGER = getLogger(__name__)
 
+# Capture filenames, e.g. image_20250304_090000_EST.jpg -> ("20250304", "090000")
+IMAGE_NAME_RE = re.compile(r"image_(\d{8})_(\d{6})_EST\.jpg")
+
+# Default encoder options for every JPEG we encode (overridable per sensor): optimal Huffman tables and progressive layout give
+# noticeably smaller files (on disk and as email attachments) for one extra encoder pass
+JPEG_SAVE_OPTIONS = {"quality": 85, "optimize": True, "progressive": True}
+
+# Above this libjpeg quality, file size grows steeply for no visible gain
+MAX_JPEG_QUALITY = 95
+
+# Supported containers for the daily animation, selected with the gif_format attribute
+ANIMATION_FORMATS = ("gif", "webp")
+
+# Seconds to let the optional gifsicle pass run before giving up on it
+GIFSICLE_TIMEOUT = 60
+
+# Seconds to wait on the SMTP server for any single connect, read or write before treating the session as dead
+SMTP_TIMEOUT = 60
+
+# Upper bound on the report images read into memory up front; larger days are read file by file
+PREFETCH_MAX_BYTES = 200 * 1024 * 1024
+
+# Longest single sleep in the scheduled loop before re-checking the wall clock
+MAX_SLEEP_SECONDS = 300
+
+# Seconds to wait after a state change before writing the state file, so bursts of changes share one write
+STATE_SAVE_DELAY = 1.0
+
+def _parse_day(day: str) -> datetime.datetime:
+    """Parse a YYYYMMDD day string, raising ValueError if it isn't one."""
+    if len(day) != 8 or not (day.isascii() and day.isdigit()):
+        raise ValueError(f"Invalid day '{day}'")
+    return datetime.datetime(int(day[:4]), int(day[4:6]), int(day[6:]))
+
+def _ordered_map(fn, items, max_workers: int = 4):
+    """Yield fn(item) for each item in order, keeping a few calls running ahead on a thread pool.
+
+    Pillow releases the GIL while decoding and encoding, so this spreads image work across cores while holding at
+    most a couple of results per worker in memory.
+    """
+    items = list(items)
+    workers = min(len(items), os.cpu_count() or 1, max_workers)
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) > workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _read_bytes(path: str) -> bytes:
+    """Read a file's full contents."""
+    with open(path, "rb") as f:
+        return f.read()
+
+@functools.lru_cache(maxsize=8)
+def _load_font(font_path: Optional[str], font_size: int):
+    """Load a font once per (path, size) pair, defaulting to Arial and falling back to Pillow's built-in font."""
+    try:
+        return ImageFont.truetype(font_path if font_path else "arial.ttf", font_size)
+    except IOError:
+        LOGGER.warning(f"Font {font_path or 'arial.ttf'} not found, using default")
+        return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=256)
+def _text_size(font, text: str) -> tuple[int, int]:
+    """Measure `text` in `font` once per (font, text) pair; fonts come from the `_load_font` cache so repeats hit."""
+    left, top, right, bottom = font.getbbox(text)
+    return right - left, bottom - top
+
+class _DisconnectedBeforeData(smtplib.SMTPServerDisconnected):
+    """The SMTP session dropped before DATA was sent, so the message was not delivered and can be retried."""
+
+def _send_pipelined(smtp: smtplib.SMTP, msg, from_addr: str, to_addrs: Sequence[str]):
+    """Send `msg`, batching MAIL FROM and every RCPT TO into a single round trip when the server
+    advertises PIPELINING (RFC 2920), and issuing them one at a time otherwise.
+
+    Raises `_DisconnectedBeforeData` if the connection drops before DATA; a drop during or after DATA raises the
+    plain `SMTPServerDisconnected`, since the server may already have accepted the message.
+    """
+    buffer = BytesIO()
+    BytesGenerator(buffer, policy=msg.policy.clone(linesep="\r\n")).flatten(msg)
+    payload = buffer.getvalue()
+    # getvalue() copies, so free the generator's buffer rather than hold two flattened messages through DATA
+    buffer.close()
+
+    try:
+        smtp.ehlo_or_helo_if_needed()
+        size_options = [f"SIZE={len(payload)}"] if smtp.has_extn("size") else []
+        if smtp.has_extn("pipelining"):
+            mail_cmd = " ".join([f"MAIL FROM:<{from_addr}>"] + size_options)
+            smtp.send("".join([f"{mail_cmd}\r\n"] + [f"RCPT TO:<{addr}>\r\n" for addr in to_addrs]))
+            # The server answers each pipelined command in order; all replies must be read before continuing
+            mail_code, mail_resp = smtp.getreply()
+            rcpt_replies = [smtp.getreply() for _ in to_addrs]
+        else:
+            mail_code, mail_resp = smtp.mail(from_addr, size_options)
+            rcpt_replies = [smtp.rcpt(addr) for addr in to_addrs] if mail_code == 250 else []
+    except smtplib.SMTPServerDisconnected as e:
+        raise _DisconnectedBeforeData(*e.args) from e
+
+    if mail_code != 250:
+        smtp.rset()
+        raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+    refused = {addr: reply for addr, reply in zip(to_addrs, rcpt_replies) if reply[0] not in (250, 251)}
+    if len(refused) == len(to_addrs):
+        smtp.rset()
+        raise smtplib.SMTPRecipientsRefused(refused)
+
+    code, resp = smtp.data(payload)
+    if code != 250:
+        smtp.rset()
+        raise smtplib.SMTPDataError(code, resp)
+    if refused:
+        LOGGER.warning(f"Recipients refused by server: {', '.join(refused)}")
+
 class EmailImages(Sensor, EasyResource):
     MODEL: ClassVar[Model] = Model(ModelFamily("hunter", "sensor"), "image-emailer")
 
@@ -60,6 +187,25 @@ class EmailImages(Sensor, EasyResource):
                     datetime.datetime.strptime(time_str, "%H:%M")
                 except ValueError:
                     raise Exception(f"Invalid capture_times_weekend entry '{time_str}': must be in 'HH:MM' format")
+        # Validate gif_format
+        if "gif_format" in attributes and attributes["gif_format"] not in ANIMATION_FORMATS:
+            raise Exception(f"Invalid gif_format '{attributes['gif_format']}': must be one of {', '.join(ANIMATION_FORMATS)}")
+        # Validate jpeg_quality
+        if "jpeg_quality" in attributes:
+            quality = attributes["jpeg_quality"]
+            if not isinstance(quality, (int, float)) or not 1 <= quality <= 100:
+                raise Exception(f"Invalid jpeg_quality '{quality}': must be a number from 1 to 100 (values above {MAX_JPEG_QUALITY} are capped)")
+        # Validate gif_width and gif_height
+        for attr in ("gif_width", "gif_height"):
+            if attr in attributes:
+                size = attributes[attr]
+                if not isinstance(size, (int, float)) or size < 1:
+                    raise Exception(f"Invalid {attr} '{size}': must be a number of pixels, at least 1")
+        # Validate thumb_max_edge
+        if "thumb_max_edge" in attributes:
+            edge = attributes["thumb_max_edge"]
+            if not isinstance(edge, (int, float)) or edge < 0:
+                raise Exception(f"Invalid thumb_max_edge '{edge}': must be a number of pixels, or 0 to attach at full resolution")
         # Validate send_time
         if "send_time" in attributes:
             try:
@@ -75,6 +221,10 @@ class EmailImages(Sensor, EasyResource):
         self.capture_times_weekday = []
         self.capture_times_weekend = []
         self.send_time = "20:00"
+        # Parsed forms of the schedule strings above, set in reconfigure
+        self._capture_times_weekday_t = []
+        self._capture_times_weekend_t = []
+        self._send_time_t = datetime.time(20, 0)
         self.camera = None
         self.camera_name = ""
         self.recipients = []
@@ -89,10 +239,40 @@ class EmailImages(Sensor, EasyResource):
         self.crop_width = 0
         self.crop_height = 0
         self.make_gif = False
+        self.gif_format = "gif"
+        self.gif_width = 800
+        self.gif_height = 600
+        self._jpeg_options = dict(JPEG_SAVE_OPTIONS)
+        self.thumb_max_edge = 0
         self.location = ""
+        # Cached YYYYMMDD string for the current date, refreshed by _date_str when the date rolls over
+        self._current_date = None
+        self._current_date_str = ""
+        # (daily_dir, mtime_ns, filenames) from the last _get_report_images scan
+        self._listing_cache = None
+        # image path -> ((mtime_ns, size, thumb edge, JPEG options), encoded JPEG) for the last report built
+        self._annotated_cache = {}
+        # (inputs signature, animation path, (mtime_ns, size)) of the last daily animation written
+        self._gif_cache = None
+        # (minute, next_capture_time, next_send_time) for get_readings; schedule times are whole minutes
+        self._schedule_cache = None
+        # (raw, formatted) last_sent_time for get_readings
+        self._last_sent_display = (None, "never")
+        self._pid = os.getpid()
+        # SMTP session reused across sends; guarded because sends run on executor threads
+        self._smtp = None
+        self._smtp_login = None
+        self._smtp_lock = threading.RLock()
+        # Blocking file, PIL and SMTP work runs here instead of the loop's shared default executor
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix=f"emailimg-{self.name}")
         # Use sensor name to create unique state and lock files per sensor
         self.state_file = os.path.join(self.base_dir, f"state_{self.name}.json")
         self.lock_file = os.path.join(self.base_dir, f"lockfile_{self.name}")
+        # Serialized state from the last successful _save_state, used to skip writes when nothing changed
+        self._last_persisted_state = None
+        # Pending coalesced write started by _request_save
+        self._state_dirty = False
+        self._save_task = None
         self._load_state()
         LOGGER.info(f"Initialized EmailImages with name: {self.name}, base_dir: {self.base_dir}, PID: {os.getpid()}, location: {self.location}")
 
@@ -119,9 +299,35 @@ class EmailImages(Sensor, EasyResource):
             "last_sent_time": self.last_sent_time,
             "last_capture_time": self.last_capture_time.isoformat() if self.last_capture_time else None
         }
-        with open(self.state_file, "w") as f:
-            json.dump(state, f)
-        LOGGER.info(f"Saved state to {self.state_file}")
+        serialized = json.dumps(state, separators=(",", ":"))
+        if serialized == self._last_persisted_state:
+            return
+        # Write to a temp file and swap it in so a crash mid-write can't leave a truncated state file
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, "w") as f:
+            f.write(serialized)
+            # Flush to the device before the rename so a power cut can't leave the new name pointing at empty data
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+        self._last_persisted_state = serialized
+        LOGGER.debug(f"Saved state to {self.state_file}")
+
+    def _request_save(self):
+        """Persist state shortly, coalescing saves requested in quick succession into a single write."""
+        self._state_dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._flush_state())
+
+    async def _flush_state(self):
+        """Write state once it has stopped changing for STATE_SAVE_DELAY seconds."""
+        while self._state_dirty:
+            await asyncio.sleep(STATE_SAVE_DELAY)
+            self._state_dirty = False
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._io_pool, self._save_state)
+            except Exception as e:
+                LOGGER.error(f"Failed to save state for {self.name}: {str(e)}")
 
     def reconfigure(self, config: ComponentConfig, dependencies: Mapping[ResourceName, ResourceBase]):
         """Configure the module and start the scheduled loop."""
@@ -131,6 +337,11 @@ class EmailImages(Sensor, EasyResource):
         self.capture_times_weekday = attributes.get("capture_times_weekday", ["7:00", "7:15", "8:00", "11:00", "11:30"])
         self.capture_times_weekend = attributes.get("capture_times_weekend", ["8:00", "8:15", "9:00", "11:00", "11:30"])
         self.send_time = attributes.get("send_time", "20:00")
+        # Parse the schedule once here rather than on every scheduler wake-up and get_readings call
+        self._capture_times_weekday_t = [datetime.datetime.strptime(t, "%H:%M").time() for t in self.capture_times_weekday]
+        self._capture_times_weekend_t = [datetime.datetime.strptime(t, "%H:%M").time() for t in self.capture_times_weekend]
+        self._send_time_t = datetime.datetime.strptime(self.send_time, "%H:%M").time()
+        self._schedule_cache = None
         self.camera_name = attributes["camera"]
         self.recipients = attributes["recipients"]
         self.base_dir = attributes.get("save_dir", "/home/hunter.volkman/images")
@@ -139,25 +350,40 @@ class EmailImages(Sensor, EasyResource):
         self.crop_width = int(float(attributes.get("crop_width", 0)))
         self.crop_height = int(float(attributes.get("crop_height", 0)))
         self.make_gif = bool(attributes.get("make_gif", False))
+        self.gif_format = attributes.get("gif_format", "gif")
+        self.gif_width = int(float(attributes.get("gif_width", 800)))
+        self.gif_height = int(float(attributes.get("gif_height", 600)))
+        self.thumb_max_edge = int(float(attributes.get("thumb_max_edge", 0)))
+        self._jpeg_options = {
+            "quality": min(int(float(attributes.get("jpeg_quality", JPEG_SAVE_OPTIONS["quality"]))), MAX_JPEG_QUALITY),
+            "optimize": bool(attributes.get("jpeg_optimize", JPEG_SAVE_OPTIONS["optimize"])),
+            "progressive": bool(attributes.get("jpeg_progressive", JPEG_SAVE_OPTIONS["progressive"])),
+        }
         self.location = attributes.get("location", "")
 
         # Update dependencies on reconfigure
         self._dependencies = dependencies
         LOGGER.info(f"Reconfigured {self.name} with base_dir: {self.base_dir}, last_capture_time: {self.last_capture_time}, capture_times_weekday: {self.capture_times_weekday}, capture_times_weekend: {self.capture_times_weekend}, make_gif: {self.make_gif}, location: {self.location}")
 
-        if not os.path.exists(self.base_dir):
-            os.makedirs(self.base_dir)
+        os.makedirs(self.base_dir, exist_ok=True)
 
         if self.capture_loop_task:
             self.capture_loop_task.cancel()
         self.capture_loop_task = asyncio.create_task(self.run_scheduled_loop())
 
-    def _get_capture_times_for_day(self, date: datetime.date) -> list[str]:
-        """Return the appropriate capture times based on the day of the week."""
+    def _date_str(self, now: datetime.datetime) -> str:
+        """Return `now` formatted as YYYYMMDD, only re-running strftime when the date changes."""
+        if now.date() != self._current_date:
+            self._current_date = now.date()
+            self._current_date_str = now.strftime("%Y%m%d")
+        return self._current_date_str
+
+    def _get_capture_times_for_day(self, date: datetime.date) -> list[datetime.time]:
+        """Return the appropriate parsed capture times based on the day of the week."""
         if date.weekday() < 5:  # Monday (0) to Friday (4)
-            return self.capture_times_weekday
+            return self._capture_times_weekday_t
         else:  # Saturday (5) and Sunday (6)
-            return self.capture_times_weekend
+            return self._capture_times_weekend_t
 
     def _get_next_capture_time(self, now: datetime.datetime) -> datetime.datetime:
         """Calculate the next capture time based on current time and day-specific capture times."""
@@ -166,17 +392,11 @@ class EmailImages(Sensor, EasyResource):
 
         # Today’s capture times
         capture_times_today = self._get_capture_times_for_day(today)
-        capture_datetimes_today = [
-            datetime.datetime.combine(today, datetime.datetime.strptime(t, "%H:%M").time())
-            for t in capture_times_today
-        ]
+        capture_datetimes_today = [datetime.datetime.combine(today, t) for t in capture_times_today]
 
         # Tomorrow’s capture times
         capture_times_tomorrow = self._get_capture_times_for_day(tomorrow)
-        capture_datetimes_tomorrow = [
-            datetime.datetime.combine(tomorrow, datetime.datetime.strptime(t, "%H:%M").time())
-            for t in capture_times_tomorrow
-        ]
+        capture_datetimes_tomorrow = [datetime.datetime.combine(tomorrow, t) for t in capture_times_tomorrow]
 
         # Combine and find the next capture after now
         all_capture_datetimes = capture_datetimes_today + capture_datetimes_tomorrow
@@ -187,12 +407,12 @@ class EmailImages(Sensor, EasyResource):
             # Fallback: first capture time of the day after tomorrow (rare case)
             day_after_tomorrow = tomorrow + datetime.timedelta(days=1)
             capture_times_next = self._get_capture_times_for_day(day_after_tomorrow)
-            return datetime.datetime.combine(day_after_tomorrow, datetime.datetime.strptime(capture_times_next[0], "%H:%M").time())
+            return datetime.datetime.combine(day_after_tomorrow, capture_times_next[0])
 
     def _get_next_send_time(self, now: datetime.datetime) -> datetime.datetime:
         """Calculate the next send time based on current time and send_time."""
         today = now.date()
-        send_time_dt = datetime.datetime.combine(today, datetime.datetime.strptime(self.send_time, "%H:%M").time())
+        send_time_dt = datetime.datetime.combine(today, self._send_time_t)
         if now > send_time_dt:
             send_time_dt += datetime.timedelta(days=1)
         return send_time_dt
@@ -205,46 +425,61 @@ class EmailImages(Sensor, EasyResource):
             return
         try:
             LOGGER.info(f"Started scheduled loop for {self.name} with PID {os.getpid()}")
+            failures = 0
             while True:
-                now = datetime.datetime.now()
-                today_str = now.strftime("%Y%m%d")
-
-                # Determine next capture time
-                next_capture = self._get_next_capture_time(now)
-                sleep_until_capture = (next_capture - now).total_seconds()
-
-                # Determine next send time
-                next_send = self._get_next_send_time(now)
-                sleep_until_send = (next_send - now).total_seconds()
-
-                # Sleep until the earliest event
-                sleep_seconds = min(sleep_until_capture, sleep_until_send)
-                LOGGER.info(f"Sleeping for {sleep_seconds:.0f} seconds until {min(next_capture, next_send)}")
-                await asyncio.sleep(sleep_seconds)
-
-                now = datetime.datetime.now()
-                # Check if it's time to capture
-                if now >= next_capture and (self.last_capture_time is None or now > self.last_capture_time):
-                    camera_resource_name = ResourceName(
-                        namespace="rdk", type="component", subtype="camera", name=self.camera_name
-                    )
-                    self.camera = self._dependencies.get(camera_resource_name)
-                    if not self.camera:
-                        LOGGER.error(f"Camera {self.camera_name} not available for {self.name}")
-                    else:
-                        await self.capture_image(now)
-                        self._save_state()
-                    self.camera = None
-
-                # Check if it's time to send the report
-                send_time_today = datetime.datetime.strptime(self.send_time, "%H:%M").time()
-                if (now.hour == send_time_today.hour and 
-                    now.minute == send_time_today.minute and 
-                    self.last_sent_date != today_str):
-                    await self.send_report(now)
-                    self.last_sent_date = today_str
-                    self.last_sent_time = str(now)
-                    self._save_state()
+                try:
+                    now = datetime.datetime.now()
+
+                    # Determine next capture time
+                    next_capture = self._get_next_capture_time(now)
+                    sleep_until_capture = (next_capture - now).total_seconds()
+
+                    # Determine next send time
+                    next_send = self._get_next_send_time(now)
+                    sleep_until_send = (next_send - now).total_seconds()
+
+                    # Sleep until the earliest event; never a negative duration if the clock was stepped meanwhile
+                    sleep_seconds = max(0.0, min(sleep_until_capture, sleep_until_send))
+                    deadline = min(next_capture, next_send)
+                    LOGGER.info(f"Sleeping for {sleep_seconds:.0f} seconds until {deadline}")
+                    # Wait for the wall-clock deadline in short slices, so a suspend or clock step is noticed within
+                    # MAX_SLEEP_SECONDS instead of trusting one long monotonic sleep
+                    while sleep_seconds > 0:
+                        await asyncio.sleep(min(sleep_seconds, MAX_SLEEP_SECONDS))
+                        sleep_seconds = (deadline - datetime.datetime.now()).total_seconds()
+
+                    now = datetime.datetime.now()
+                    # Taken after waking so a sleep that crosses midnight sees the new date
+                    today_str = self._date_str(now)
+                    # Check if it's time to capture
+                    if now >= next_capture and (self.last_capture_time is None or now > self.last_capture_time):
+                        camera_resource_name = ResourceName(
+                            namespace="rdk", type="component", subtype="camera", name=self.camera_name
+                        )
+                        self.camera = self._dependencies.get(camera_resource_name)
+                        if not self.camera:
+                            LOGGER.error(f"Camera {self.camera_name} not available for {self.name}")
+                        else:
+                            await self.capture_image(now)
+                            self._request_save()
+                        self.camera = None
+
+                    # Check if it's time to send the report
+                    send_time_today = self._send_time_t
+                    if (now.hour == send_time_today.hour and 
+                        now.minute == send_time_today.minute and 
+                        self.last_sent_date != today_str):
+                        await self.send_report(now)
+                        self.last_sent_date = today_str
+                        self.last_sent_time = str(now)
+                        self._request_save()
+                    failures = 0
+                except Exception as e:
+                    # Keep scheduling through transient camera, disk or SMTP errors, backing off while they persist
+                    failures += 1
+                    delay = min(60, 2 ** failures)
+                    LOGGER.error(f"Scheduled loop iteration failed for {self.name} ({failures} in a row), retrying in {delay}s: {str(e)}")
+                    await asyncio.sleep(delay)
 
         except Exception as e:
             LOGGER.error(f"Scheduled loop failed for {self.name}: {str(e)}")
@@ -258,21 +493,16 @@ class EmailImages(Sensor, EasyResource):
             try:
                 LOGGER.info(f"Attempting capture for {self.name} at {now} (attempt {attempt + 1})")
                 image = await self.camera.get_image()
-                img = Image.open(BytesIO(image.data))
-                crop_width = self.crop_width or img.width - self.crop_left
-                crop_height = self.crop_height or img.height - self.crop_top
-                crop_top = max(0, min(self.crop_top, img.height - 1))
-                crop_left = max(0, min(self.crop_left, img.width - 1))
-                crop_width = min(crop_width, img.width - crop_left)
-                crop_height = min(crop_height, img.height - crop_top)
-                cropped_img = img.crop((crop_left, crop_top, crop_left + crop_width, crop_top + crop_height))
-
-                today_str = now.strftime('%Y%m%d')
+
+                today_str = self._date_str(now)
                 daily_dir = os.path.join(self.base_dir, today_str)
-                os.makedirs(daily_dir, exist_ok=True)
                 filename = f"image_{now.strftime('%Y%m%d_%H%M%S')}_EST.jpg"
                 save_path = os.path.join(daily_dir, filename)
-                cropped_img.save(save_path, "JPEG")
+
+                # Decode, crop and encode on the worker pool so the event loop stays responsive
+                await asyncio.get_running_loop().run_in_executor(
+                    self._io_pool, self._process_and_save, image.data, image.mime_type, save_path
+                )
                 self.last_capture_time = now
                 LOGGER.info(f"Saved image for {self.name}: {save_path}")
                 break
@@ -283,111 +513,300 @@ class EmailImages(Sensor, EasyResource):
                 else:
                     LOGGER.error(f"All capture attempts failed for {self.name} at {now}")
 
-    def annotate_image(self, image_path: str, font_path: Optional[str] = None, font_size: int = 20) -> Image.Image:
-        """Annotate an image with its timestamp in the bottom-right corner."""
-        img = Image.open(image_path)
+    def _process_and_save(self, image_data: bytes, mime_type: str, save_path: str):
+        """Crop a captured frame to the configured region and save it as a JPEG."""
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        if mime_type == CameraMimeType.JPEG and not (self.crop_top or self.crop_left or self.crop_width or self.crop_height):
+            # No crop configured: the camera's JPEG is already the final image, so skip the decode/re-encode
+            with open(save_path, "wb") as f:
+                f.write(image_data)
+            return
+
+        img = Image.open(BytesIO(image_data))
+        crop_width = self.crop_width or img.width - self.crop_left
+        crop_height = self.crop_height or img.height - self.crop_top
+        crop_top = max(0, min(self.crop_top, img.height - 1))
+        crop_left = max(0, min(self.crop_left, img.width - 1))
+        crop_width = min(crop_width, img.width - crop_left)
+        crop_height = min(crop_height, img.height - crop_top)
+        cropped_img = img.crop((crop_left, crop_top, crop_left + crop_width, crop_top + crop_height))
+        cropped_img.save(save_path, "JPEG", **self._jpeg_options)
+
+    def annotate_image(self, image_path: str, font_path: Optional[str] = None, font_size: int = 20, data: Optional[bytes] = None,
+                       max_size: Optional[tuple[int, int]] = None) -> Image.Image:
+        """Annotate an image with its timestamp in the bottom-right corner.
+
+        If `data` is given it is decoded instead of re-reading `image_path` from disk. With `max_size` the image is
+        shrunk to fit before annotating; for JPEGs this happens during decode, at a fraction of the full cost.
+        """
+        img = Image.open(BytesIO(data) if data is not None else image_path)
+        if max_size is not None:
+            # thumbnail() asks libjpeg for a 1/2, 1/4 or 1/8 scale decode before resizing the remainder
+            img.thumbnail(max_size)
         draw = ImageDraw.Draw(img)
 
         # Extract timestamp from filename
         # e.g., image_20250304_090000_EST.jpg
-        filename = os.path.basename(image_path)
-        try:
-            parts = filename.split('_')
-            if len(parts) >= 3:
-                # e.g., "090000"
-                time_str = parts[2]
-                formatted_time = f"{time_str[0:2]}:{time_str[2:4]}:{time_str[4:6]} EST"
-            else:
-                formatted_time = "unknown"
-        except Exception:
+        match = IMAGE_NAME_RE.fullmatch(os.path.basename(image_path))
+        if match:
+            # e.g., "090000"
+            time_str = match.group(2)
+            formatted_time = f"{time_str[0:2]}:{time_str[2:4]}:{time_str[4:6]} EST"
+        else:
             formatted_time = "unknown"
 
-        # Load font (default to Arial if specified font fails)
-        try:
-            font = ImageFont.truetype(font_path if font_path else "arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
-            LOGGER.warning(f"Font {font_path or 'arial.ttf'} not found, using default")
+        font = _load_font(font_path, font_size)
 
         # Position text in bottom-right with padding
-        text_bbox = draw.textbbox((0, 0), formatted_time, font=font)
-        text_width, text_height = text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1]
+        text_width, text_height = _text_size(font, formatted_time)
         x = img.width - text_width - 10
         y = img.height - text_height - 10
 
-        # Semi-transparent black rectangle for readability
-        draw.rectangle([x-5, y-5, x+text_width+5, y+text_height+5], fill=(0, 0, 0, 128))
+        # Semi-transparent black rectangle for readability. ImageDraw ignores the alpha of a fill on an RGB image,
+        # so halve the box's brightness with a lookup table over just that region instead
+        box = (x - 5, y - 5, x + text_width + 5, y + text_height + 5)
+        img.paste(img.crop(box).point(lambda v: v // 2), box)
         draw.text((x, y), formatted_time, fill="white", font=font)
         return img
 
-    def create_daily_gif(self, daily_dir: str, frame_duration: int = 1000, font_path: Optional[str] = None, font_size: int = 20) -> str:
-        """Create an animated GIF from daily images, saved as 'daily.gif'."""
-        image_files = sorted(
-            [os.path.join(daily_dir, f) for f in os.listdir(daily_dir) if f.startswith("image_") and f.endswith("_EST.jpg")],
-            key=lambda x: os.path.basename(x).split('_')[2]
-        )
-        if not image_files:
+    def create_daily_gif(self, daily_dir: str, frame_duration: int = 1000, font_path: Optional[str] = None, font_size: int = 20,
+                         image_files: Optional[Sequence[str]] = None, image_data: Optional[Mapping[str, bytes]] = None) -> str:
+        """Create an animation from daily images, saved as 'daily.gif' (or 'daily.webp' when gif_format is "webp").
+
+        `image_files` limits the animation to those filenames (default: every capture in `daily_dir`), and
+        `image_data` maps filenames to bytes that were already read, so they are not read from disk again.
+        """
+        if image_files is None:
+            image_files = self._get_report_images(daily_dir, os.path.basename(daily_dir))
+        image_data = image_data or {}
+        frame_count = len(image_files)
+        # Annotate frames as the encoder asks for them; the GIF path never holds every decoded RGB frame at once
+        def load(image_file):
+            return self.annotate_image(os.path.join(daily_dir, image_file), font_path, font_size,
+                                       data=image_data.get(image_file), max_size=(self.gif_width, self.gif_height))
+        middle_index = frame_count // 2
+        middle = load(image_files[middle_index]) if image_files else None
+        def frame_at(index):
+            # The middle frame was already annotated to seed the palette
+            return middle if index == middle_index else load(image_files[index])
+        frame_iter = _ordered_map(frame_at, range(frame_count))
+        if middle is None:
             LOGGER.warning(f"No images found in {daily_dir} for GIF creation for {self.name}")
             raise ValueError("No images available for GIF")
 
-        frames = []
-        for image_path in image_files:
-            frame = self.annotate_image(image_path, font_path, font_size)
-            frames.append(frame.convert("P", palette=Image.ADAPTIVE))
+        if self.gif_format == "webp":
+            # Animated WebP keeps full color and is far smaller than a 256-color GIF, but not every mail client plays it.
+            # Pillow's WebP writer collects append_images into a list before encoding, so every RGB frame is in memory
+            # at once here
+            gif_path = os.path.join(daily_dir, "daily.webp")
+            first = next(frame_iter)
+            first.save(gif_path, save_all=True, append_images=frame_iter, duration=frame_duration, loop=0, quality=80)
+        else:
+            # Quantize every frame against one palette built from the middle frame: a single octree pass instead
+            # of one per frame, and a stable palette lets the GIF encoder store only what changed between frames
+            palette = middle.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+            quantized = (frame.quantize(palette=palette, dither=Image.Dither.NONE) for frame in frame_iter)
+
+            gif_path = os.path.join(daily_dir, "daily.gif")
+            # The GIF writer pulls append_images lazily, so only 8-bit frames accumulate while it encodes
+            first = next(quantized)
+            first.save(gif_path, save_all=True, append_images=quantized, duration=frame_duration, loop=0, optimize=True)
+            self._optimize_gif(gif_path)
+        LOGGER.info(f"Created daily GIF for {self.name} at {gif_path} with {frame_count} frames")
+        return gif_path
+
+    def _optimize_gif(self, gif_path: str):
+        """Losslessly recompress a GIF in place with gifsicle -O3, if it is installed."""
+        gifsicle = shutil.which("gifsicle")
+        if gifsicle is None:
+            return
+        try:
+            result = subprocess.run([gifsicle, "-O3", "--batch", gif_path], capture_output=True, timeout=GIFSICLE_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            LOGGER.warning(f"gifsicle failed for {self.name}, keeping Pillow's GIF: {str(e)}")
+            return
+        if result.returncode != 0:
+            LOGGER.warning(f"gifsicle exited with {result.returncode} for {self.name}, keeping Pillow's GIF: {result.stderr.decode(errors='replace').strip()}")
+
+    def _create_daily_gif_cached(self, daily_dir: str, image_files: Sequence[str], frame_duration: int = 1000,
+                                 image_data: Optional[Mapping[str, bytes]] = None) -> str:
+        """Run create_daily_gif, or return the last animation if it was built from the same unchanged images and settings."""
+        stamps = []
+        for image_file in image_files:
+            st = os.stat(os.path.join(daily_dir, image_file))
+            stamps.append((image_file, st.st_mtime_ns, st.st_size))
+        signature = (daily_dir, tuple(stamps), self.gif_format, (self.gif_width, self.gif_height), frame_duration)
 
-        gif_path = os.path.join(daily_dir, "daily.gif")
-        frames[0].save(gif_path, save_all=True, append_images=frames[1:], duration=frame_duration, loop=0)
-        LOGGER.info(f"Created daily GIF for {self.name} at {gif_path} with {len(frames)} frames")
+        cached = self._gif_cache
+        if cached is not None and cached[0] == signature:
+            try:
+                st = os.stat(cached[1])
+                if (st.st_mtime_ns, st.st_size) == cached[2]:
+                    LOGGER.info(f"Reusing daily GIF for {self.name} at {cached[1]}")
+                    return cached[1]
+            except OSError:
+                pass
+
+        gif_path = self.create_daily_gif(daily_dir, frame_duration=frame_duration, image_files=image_files,
+                                         image_data=image_data)
+        st = os.stat(gif_path)
+        self._gif_cache = (signature, gif_path, (st.st_mtime_ns, st.st_size))
         return gif_path
 
+    def _get_report_images(self, daily_dir: str, day: str) -> list[str]:
+        """Return the day's capture filenames in chronological order.
+
+        The last listing is cached and reused until the directory's mtime changes, so the report, its GIF and
+        manual commands for the same day share a single scan.
+        """
+        mtime = os.stat(daily_dir).st_mtime_ns
+        cached = self._listing_cache
+        if cached and cached[0] == daily_dir and cached[1] == mtime:
+            return list(cached[2])
+
+        names = []
+        with os.scandir(daily_dir) as entries:
+            for entry in entries:
+                match = IMAGE_NAME_RE.fullmatch(entry.name)
+                if match and match.group(1) == day and entry.is_file():
+                    names.append(entry.name)
+        # Names are fixed-width image_YYYYMMDD_HHMMSS_EST.jpg, so lexicographic order is chronological
+        names.sort()
+        self._listing_cache = (daily_dir, mtime, names)
+        return list(names)
+
     async def send_report(self, now):
         """Send a daily report with all captured images."""
-        today_str = now.strftime('%Y%m%d')
+        today_str = self._date_str(now)
         daily_dir = os.path.join(self.base_dir, today_str)
-        if not os.path.exists(daily_dir):
+        try:
+            images_to_send = await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self._get_report_images, daily_dir, today_str
+            )
+        except FileNotFoundError:
             LOGGER.info(f"No directory for {today_str} for {self.name}, skipping report")
             self.report = "no_images"
             return
-
-        all_images = [f for f in os.listdir(daily_dir) if f.startswith(f"image_{today_str}") and f.endswith("_EST.jpg")]
-        if not all_images:
+        if not images_to_send:
             LOGGER.info(f"No images for {today_str} for {self.name}, skipping report")
             self.report = "no_images"
             return
 
-        images_to_send = sorted(all_images, key=lambda x: x.split('_')[1] + x.split('_')[2].split('.')[0])
         try:
             LOGGER.info(f"Sending report for {self.name} with {len(images_to_send)} images at {now}")
+            image_data = await self._read_images(daily_dir, images_to_send)
             await asyncio.get_running_loop().run_in_executor(
-                None,
-                functools.partial(self._send_daily_report_sync, images_to_send, now, daily_dir)
+                self._io_pool, self._send_daily_report_sync, images_to_send, now, daily_dir, image_data
             )
             self.report = "sent"
             self.last_sent_date = today_str
             self.last_sent_time = str(now)
-            self._save_state()
-            LOGGER.info(f"Sent report for {self.name} with {len(images_to_send)} images to {', '.join(self.recipients)}")
+            self._request_save()
+            LOGGER.info("Sent report for %s with %d images to %s", self.name, len(images_to_send), ", ".join(self.recipients))
         except Exception as e:
             self.report = f"error: {str(e)}"
             LOGGER.error(f"Email send error for {self.name} at {now}: {str(e)}")
 
-    def _send_daily_report_sync(self, image_files, timestamp, daily_dir):
-        """Send the daily email report, optionally including a GIF if make_gif is enabled."""
+    async def _read_images(self, daily_dir: str, image_files: Sequence[str]) -> dict[str, bytes]:
+        """Read the report images concurrently so slow storage reads overlap instead of running back to back.
+
+        Returns an empty mapping when the day's images exceed PREFETCH_MAX_BYTES; the report then reads each file as
+        it is annotated instead of holding them all at once.
+        """
+        loop = asyncio.get_running_loop()
+        paths = [os.path.join(daily_dir, f) for f in image_files]
+        total = await loop.run_in_executor(self._io_pool, lambda: sum(os.path.getsize(p) for p in paths))
+        if total > PREFETCH_MAX_BYTES:
+            LOGGER.info(f"Not prefetching {total} bytes of images for {self.name}, reading them on demand")
+            return {}
+        contents = await asyncio.gather(
+            *(loop.run_in_executor(self._io_pool, _read_bytes, path) for path in paths)
+        )
+        return dict(zip(image_files, contents))
+
+    def _send_daily_report_sync(self, image_files, timestamp, daily_dir, image_data=None):
+        """Send the daily email report, optionally including a GIF if make_gif is enabled.
+
+        `image_data` maps image filenames to their already-read bytes; files missing from it are read from disk. It is
+        emptied once the message is built, so the prefetched bytes aren't held while the report is sent.
+        """
+        msg = self._build_message(image_files, timestamp, daily_dir, image_data)
+        if image_data:
+            # The message carries its own encoded copy of every attachment from here on
+            image_data.clear()
+        self._send_message(msg)
+
+    def _build_message(self, image_files, timestamp, daily_dir, image_data=None) -> MIMEMultipart:
+        """Build the daily report message: annotated attachments, HTML body and the optional inline GIF."""
         msg = MIMEMultipart("mixed")
         msg["From"] = self.email
         msg["Subject"] = f"Daily Report - {self.location} - {timestamp.strftime('%Y-%m-%d')}"
         msg["To"] = ", ".join(self.recipients)
 
+        # Annotate and encode each image once; only the JPEG bytes are kept, the GIF decodes its own smaller frames
+        image_data = dict(image_data or {})
+
+        annotated_cache = self._annotated_cache
+        fresh_cache = {}
+
+        def prepare(image_file):
+            image_path = os.path.join(daily_dir, image_file)
+            try:
+                st = os.stat(image_path)
+                stamp = (st.st_mtime_ns, st.st_size, self.thumb_max_edge, tuple(sorted(self._jpeg_options.items())))
+            except OSError:
+                stamp = None
+            cached = annotated_cache.get(image_path)
+            if stamp is not None and cached is not None and cached[0] == stamp:
+                fresh_cache[image_path] = cached
+                return cached[1]
+            result = annotate_and_encode(image_file, image_path)
+            if stamp is not None and result is not None:
+                fresh_cache[image_path] = (stamp, result)
+            return result
+
+        def annotate_and_encode(image_file, image_path):
+            # Images that weren't prefetched are only kept in memory if the original has to be attached instead
+            data = image_data.get(image_file)
+            if data is None:
+                data = _read_bytes(image_path)
+            try:
+                # With thumb_max_edge, shrink before annotating so the timestamp keeps its size on the smaller image
+                max_size = (self.thumb_max_edge, self.thumb_max_edge) if self.thumb_max_edge > 0 else None
+                img = self.annotate_image(image_path, font_path=None, font_size=20, data=data, max_size=max_size)
+            except Exception as e:
+                LOGGER.warning(f"Failed to annotate {image_file} for {self.name}: {str(e)}")
+                image_data[image_file] = data
+                return None
+            try:
+                # Encode the annotated image in memory rather than round-tripping through a temp file
+                buffer = BytesIO()
+                img.save(buffer, "JPEG", **self._jpeg_options)
+                return buffer.getvalue()
+            except Exception as e:
+                LOGGER.warning(f"Failed to encode annotated {image_file} for {self.name}: {str(e)}")
+                image_data[image_file] = data
+                return None
+            finally:
+                # Free the decoded pixels now; only the encoded bytes outlive this image, so the prefetch cap
+                # bounds what the report holds
+                img.close()
+
+        results = list(_ordered_map(prepare, image_files))
+        # Keep only this report's images so a resend of the same day skips the PIL work entirely
+        self._annotated_cache = fresh_cache
+        encoded = {f: r for f, r in zip(image_files, results) if r is not None}
+
         # Create GIF if enabled
         gif_path = None
         if self.make_gif:
             try:
-                gif_path = self.create_daily_gif(daily_dir, frame_duration=1000, font_path=None, font_size=20)
+                gif_files = [f for f in image_files if f in encoded]
+                gif_path = self._create_daily_gif_cached(daily_dir, gif_files, frame_duration=1000, image_data=image_data)
             except Exception as e:
                 LOGGER.error(f"Failed to create GIF for {self.name}: {str(e)}")
 
         # Build HTML body with optional GIF
-        related = MIMEMultipart("related")
         html_body = f"""
         <html>
           <body>
@@ -396,80 +815,113 @@ class EmailImages(Sensor, EasyResource):
         if gif_path:
             html_body += '<p>Daily GIF:</p><img src="cid:dailygif">'
         html_body += "</body></html>"
-        related.attach(MIMEText(html_body, "html"))
-        msg.attach(related)
+        html_part = MIMEText(html_body, "html")
 
-        # Attach GIF inline if created
-        if gif_path and os.path.exists(gif_path):
+        if gif_path:
+            # Keep the inline GIF in the same multipart/related part as the HTML that references cid:dailygif
+            related = MIMEMultipart("related")
+            related.attach(html_part)
             with open(gif_path, "rb") as gif_file:
-                gif_part = MIMEImage(gif_file.read(), _subtype="gif")
-                gif_part.add_header("Content-ID", "<dailygif>")
-                gif_part.add_header("Content-Disposition", "inline", filename="daily.gif")
-                msg.attach(gif_part)
+                gif_part = MIMEImage(gif_file.read(), _subtype=self.gif_format)
+            gif_part.add_header("Content-ID", "<dailygif>")
+            gif_part.add_header("Content-Disposition", "inline", filename=os.path.basename(gif_path))
+            related.attach(gif_part)
+            msg.attach(related)
+        else:
+            msg.attach(html_part)
 
-        # Annotate and attach individual images
+        # Attach individual images, annotated where possible
         for image_file in image_files:
-            image_path = os.path.join(daily_dir, image_file)
-            try:
-                # Annotate the image
-                annotated_img = self.annotate_image(image_path, font_path=None, font_size=20)
-                
-                # Create a temporary file for the annotated image
-                temp_path = image_path.replace(".jpg", "_annotated.jpg")
-                annotated_img.save(temp_path, "JPEG")
-                
-                # Attach the annotated image
-                with open(temp_path, "rb") as file:
-                    attachment = MIMEBase("application", "octet-stream")
-                    attachment.set_payload(file.read())
-                    encoders.encode_base64(attachment)
-                    attachment.add_header("Content-Disposition", f"attachment; filename={os.path.basename(temp_path)}")
-                    msg.attach(attachment)
-                
-                # Clean up the temporary file after attaching
-                os.remove(temp_path)
-            except Exception as e:
-                LOGGER.warning(f"Failed to annotate or attach {image_file} for {self.name}: {str(e)}")
-                # Fallback: attach the original image if annotation fails
-                with open(image_path, "rb") as file:
-                    attachment = MIMEBase("application", "octet-stream")
-                    attachment.set_payload(file.read())
-                    encoders.encode_base64(attachment)
-                    attachment.add_header("Content-Disposition", f"attachment; filename={image_file}")
-                    msg.attach(attachment)
-
-        with smtplib.SMTP("smtp.gmail.com", 587) as smtp:
+            if image_file in encoded:
+                attachment = MIMEImage(encoded[image_file], _subtype="jpeg")
+                attachment.add_header("Content-Disposition", "attachment", filename=image_file.replace(".jpg", "_annotated.jpg"))
+                msg.attach(attachment)
+                continue
+            # Fallback: attach the original image if annotation fails
+            attachment = MIMEImage(image_data[image_file], _subtype="jpeg")
+            attachment.add_header("Content-Disposition", "attachment", filename=image_file)
+            msg.attach(attachment)
+
+        return msg
+
+    def _send_message(self, msg):
+        """Send a built report over the cached SMTP session."""
+        with self._smtp_lock:
+            for attempt in range(2):
+                smtp = self._get_smtp()
+                try:
+                    _send_pipelined(smtp, msg, self.email, self.recipients)
+                    break
+                except _DisconnectedBeforeData as e:
+                    # The server may drop an idle session between NOOP and MAIL; reconnect and retry once. A drop
+                    # during DATA is not retried, since the message may already have been delivered
+                    self._close_smtp()
+                    if attempt:
+                        raise
+                    LOGGER.warning(f"SMTP session for {self.name} disconnected, reconnecting: {str(e)}")
+                except Exception:
+                    # Don't reuse a session left in an unknown state
+                    self._close_smtp()
+                    raise
+        LOGGER.info("Daily report sent for %s to %s", self.name, msg["To"])
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return a logged-in SMTP session, reusing the cached one while it still answers NOOP."""
+        with self._smtp_lock:
+            if self._smtp is not None and self._smtp_login == (self.email, self.password):
+                try:
+                    if self._smtp.noop()[0] == 250:
+                        return self._smtp
+                except OSError:
+                    pass
+            self._close_smtp()
+            smtp = smtplib.SMTP("smtp.gmail.com", 587, timeout=SMTP_TIMEOUT)
             smtp.starttls()
             smtp.login(self.email, self.password)
-            smtp.send_message(msg)
-            LOGGER.info(f"Daily report sent for {self.name} to {msg['To']}{' with GIF' if gif_path else ''}")
+            self._smtp = smtp
+            self._smtp_login = (self.email, self.password)
+            LOGGER.info(f"Opened SMTP session for {self.name}")
+            return smtp
+
+    def _close_smtp(self):
+        """Close the cached SMTP session, if any."""
+        with self._smtp_lock:
+            if self._smtp is None:
+                return
+            try:
+                self._smtp.quit()
+            except OSError:
+                self._smtp.close()
+            self._smtp = None
+            self._smtp_login = None
 
     async def do_command(self, command: Mapping[str, Any], *, timeout: Optional[float] = None, **kwargs) -> Mapping[str, Any]:
         if command.get("command") == "send_email":
             day = command.get("day", datetime.datetime.now().strftime('%Y%m%d'))
             try:
-                timestamp = datetime.datetime.strptime(day, '%Y%m%d')
+                timestamp = _parse_day(day)
                 daily_dir = os.path.join(self.base_dir, day)
-                if not os.path.exists(daily_dir):
+                try:
+                    images_to_send = await asyncio.get_running_loop().run_in_executor(
+                        self._io_pool, self._get_report_images, daily_dir, day
+                    )
+                except FileNotFoundError:
                     LOGGER.info(f"No directory for {day} for {self.name}")
                     return {"status": f"No images directory for {day}"}
-
-                all_images = [f for f in os.listdir(daily_dir) if f.startswith(f"image_{day}") and f.endswith("_EST.jpg")]
-                if not all_images:
+                if not images_to_send:
                     LOGGER.info(f"No images for {day} for {self.name}")
                     return {"status": f"No images found for {day}"}
 
-                images_to_send = sorted(all_images, key=lambda x: x.split('_')[1] + x.split('_')[2].split('.')[0])
                 LOGGER.info(f"Manual send for {self.name} for {day} with {len(images_to_send)} images")
+                image_data = await self._read_images(daily_dir, images_to_send)
                 await asyncio.get_running_loop().run_in_executor(
-                    None,
-                    functools.partial(self._send_daily_report_sync, images_to_send, timestamp, daily_dir)
+                    self._io_pool, self._send_daily_report_sync, images_to_send, timestamp, daily_dir, image_data
                 )
                 self.report = "sent"
                 self.last_sent_date = day
                 self.last_sent_time = str(timestamp)
-                self._save_state()
-                LOGGER.info(f"Manual report sent for {self.name} with {len(images_to_send)} images to {', '.join(self.recipients)}")
+                self._request_save()
+                LOGGER.info("Manual report sent for %s with %d images to %s", self.name, len(images_to_send), ", ".join(self.recipients))
                 return {"status": f"Sent email with {len(images_to_send)} images for {day}"}
             except ValueError:
                 return {"status": f"Invalid day format: {day}, use YYYYMMDD"}
@@ -479,21 +931,22 @@ class EmailImages(Sensor, EasyResource):
         elif command.get("command") == "create_gif":
             day = command.get("day", datetime.datetime.now().strftime('%Y%m%d'))
             try:
-                datetime.datetime.strptime(day, '%Y%m%d')
+                _parse_day(day)
                 daily_dir = os.path.join(self.base_dir, day)
-                if not os.path.exists(daily_dir):
+                try:
+                    all_images = await asyncio.get_running_loop().run_in_executor(
+                        self._io_pool, self._get_report_images, daily_dir, day
+                    )
+                except FileNotFoundError:
                     LOGGER.info(f"No directory for {day} for {self.name}")
                     return {"status": f"No images directory for {day}"}
-
-                all_images = [f for f in os.listdir(daily_dir) if f.startswith(f"image_{day}") and f.endswith("_EST.jpg")]
                 if not all_images:
                     LOGGER.info(f"No images for {day} for {self.name}")
                     return {"status": f"No images found for {day}"}
 
                 LOGGER.info(f"Creating GIF for {self.name} for {day} with {len(all_images)} images")
                 gif_path = await asyncio.get_running_loop().run_in_executor(
-                    None,
-                    functools.partial(self.create_daily_gif, daily_dir)
+                    self._io_pool, self._create_daily_gif_cached, daily_dir, all_images
                 )
                 return {"status": f"Created GIF for {day} at {gif_path}"}
             except ValueError:
@@ -503,21 +956,38 @@ class EmailImages(Sensor, EasyResource):
 
         return {"status": "Unknown command"}
 
+    async def close(self):
+        """Stop the scheduled loop and release the SMTP session and worker threads when the resource is removed."""
+        if self.capture_loop_task:
+            self.capture_loop_task.cancel()
+        # Let a pending coalesced state write land before the pool goes away
+        if self._save_task is not None and not self._save_task.done():
+            await self._save_task
+        await asyncio.get_running_loop().run_in_executor(self._io_pool, self._close_smtp)
+        self._io_pool.shutdown(wait=False)
+
     async def get_readings(self, *, extra: Optional[Mapping[str, Any]] = None, timeout: Optional[float] = None, **kwargs) -> Mapping[str, SensorReading]:
         """Return the current state of the sensor, including scheduling details for debugging."""
         now = datetime.datetime.now()
-        LOGGER.info(f"get_readings called for {self.name} at EST {now.strftime('%H:%M:%S')}")
-        next_send_time = self._get_next_send_time(now)
+        LOGGER.info("get_readings called for %s at EST %02d:%02d:%02d", self.name, now.hour, now.minute, now.second)
+        # The schedule only has minute resolution, so the next times can't change within a minute
+        minute = now.replace(second=0, microsecond=0)
+        if self._schedule_cache is None or self._schedule_cache[0] != minute:
+            self._schedule_cache = (minute, self._get_next_capture_time(now), self._get_next_send_time(now))
+        _, next_capture_time, next_send_time = self._schedule_cache
+        if self._last_sent_display[0] != self.last_sent_time:
+            formatted = str(datetime.datetime.fromisoformat(self.last_sent_time)) if self.last_sent_time and self.last_sent_time != "never" else "never"
+            self._last_sent_display = (self.last_sent_time, formatted)
         return {
             "status": "running",
             "last_capture_time": str(self.last_capture_time) if self.last_capture_time else "none",
             "report": self.report,
             "last_sent_date": self.last_sent_date if self.last_sent_date else "never",
-            "last_sent_time": str(datetime.datetime.fromisoformat(self.last_sent_time)) if self.last_sent_time and self.last_sent_time != "never" else "never",
-            "pid": os.getpid(),
+            "last_sent_time": self._last_sent_display[1],
+            "pid": self._pid,
             "gif": self.make_gif,
             "location": self.location,
-            "next_capture_time": str(self._get_next_capture_time(now)),
+            "next_capture_time": str(next_capture_time),
             "next_send_date": next_send_time.strftime("%Y%m%d"),
             "next_send_time": str(next_send_time),
             "capture_times_weekday": self.capture_times_weekday,
@@ -525,11 +995,3 @@ class EmailImages(Sensor, EasyResource):
             "state": self.state_file,
             "lock": self.lock_file
         }
-
-async def main():
-    module = Module.from_args()
-    module.add_model_from_registry(Sensor.API, EmailImages.MODEL)
-    await module.start()
-
-if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file